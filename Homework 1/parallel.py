@@ -0,0 +1,25 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+def map_in_processes(function, *sequences):
+    """
+    Applies a function to every item of the given sequences, in worker processes when that pays off.
+
+    At most one worker is started per item, capped at the number of CPUs. When that
+    leaves a single worker, the items are processed in the current process instead,
+    since a pool would only add start-up cost. The function must be defined at module
+    level so that it can be pickled for the workers.
+
+    Args:
+        function (callable): The function to apply. It receives one item from each sequence.
+        *sequences (list): Sequences of equal length holding the arguments.
+
+    Returns:
+        list: The results, in the same order as the items.
+    """
+    workers = min(len(sequences[0]), os.cpu_count() or 1)
+    if workers <= 1:
+        return list(map(function, *sequences))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, *sequences))
@@ -1,8 +1,87 @@
-import pandas as pd
-import glob
 import os
 import argparse
-import json
+import orjson
+import mmap
+import csv
+import functools
+from parallel import map_in_processes
+
+def count_data_rows(file_path):
+    """
+    Counts the number of data rows in a CSV file without parsing it.
+
+    On Python 3.13+, the file is memory-mapped read-only and newline bytes are
+    counted in place with mmap.count, so nothing is copied. Older versions
+    have no mmap.count and fall back to counting over 1 MiB binary reads. The
+    header line is not included in the count, and a final line without a
+    trailing newline is still counted.
+
+    Args:
+        file_path (str): The path to the CSV file.
+
+    Returns:
+        int: The number of data rows in the file.
+    """
+    with open(file_path, 'rb') as f:
+        # Empty files cannot be memory-mapped and go through the read loop
+        if hasattr(mmap.mmap, 'count') and os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                newlines = mm.count(b'\n')
+                last_byte = mm[-1:]
+        else:
+            newlines = 0
+            last_byte = b'\n'
+            for buf in iter(lambda: f.read(1 << 20), b''):
+                newlines += buf.count(b'\n')
+                last_byte = buf[-1:]
+
+    # Count an unterminated last line, then drop the header
+    if last_byte != b'\n':
+        newlines += 1
+    return max(newlines - 1, 0)
+
+def scan_csv_file(file_name, directory, normalize=False):
+    """
+    Builds the parameter entry for a single CSV file.
+
+    This is the per-file body of get_csv_parameters, which may run it in a
+    worker process.
+
+    Args:
+        file_name (str): The name of the CSV file.
+        directory (str): The path to the directory containing the CSV file.
+        normalize (bool, optional): If True, sets a flag indicating that the
+            data should be normalized. Defaults to False.
+
+    Returns:
+        tuple: A (file_name, parameters) pair, or None if the file could not
+               be processed.
+    """
+    file_path = os.path.join(directory, file_name)
+    try:
+        # Only the header line is parsed; rows are counted from raw bytes.
+        # Unnamed columns come back from csv.reader as empty strings.
+        with open(file_path, 'r', newline='', encoding='utf-8-sig') as f:
+            columns = next(csv.reader(f), [])
+        # A missing or blank first line leaves no header to read
+        if not columns:
+            raise ValueError("No columns to parse from file")
+
+        other_params = {}
+        if file_name == 'fetal.csv':
+            other_params['do_not_include'] = ['histogram', 'mean', 'percent']
+        
+        other_params['normalize'] = normalize
+
+        return file_name, {
+            'lines_to_read': count_data_rows(file_path),
+            'columns': columns,
+            'file_name': file_name,
+            'other_parameters': other_params
+        }
+    except Exception as e:
+        print(f"Could not process {file_path}: {e}")
+        return None
 
 def get_csv_parameters(directory, normalize=False):
     """
@@ -12,7 +91,7 @@ def get_csv_parameters(directory, normalize=False):
     determine its properties (like number of lines and column names), and
     compiles these into a dictionary. It can also set a normalization flag
     for the data processing step. Specific columns can be excluded for
-    certain files.
+    certain files. Files are scanned in parallel when several CPUs are available.
 
     Args:
         directory (str): The path to the directory containing the CSV files.
@@ -24,37 +103,21 @@ def get_csv_parameters(directory, normalize=False):
               another dictionary containing parameters like 'lines_to_read',
               'columns', 'file_name', and 'other_parameters'.
     """
-    csv_files = [
-        file for file in glob.glob(os.path.join(directory, '*.csv'))
-        if "_transformed" not in os.path.basename(file)
-    ]
+    # A single directory listing; entry names need no per-file path splitting
+    with os.scandir(directory) as entries:
+        csv_files = [
+            entry.name for entry in entries
+            if entry.is_file(follow_symlinks=False)
+            and entry.name.endswith('.csv')
+            and "_transformed" not in entry.name
+        ]
     parameters = {}
 
-    for file_path in csv_files:
-        try:
-            df = pd.read_csv(file_path)
-            file_name = os.path.basename(file_path)
-
-            # Handle unnamed columns
-            df.columns = [
-                col if not col.startswith('Unnamed:') else ''
-                for col in df.columns
-            ]
-
-            other_params = {}
-            if file_name == 'fetal.csv':
-                other_params['do_not_include'] = ['histogram', 'mean', 'percent']
-            
-            other_params['normalize'] = normalize
-
-            parameters[file_name] = {
-                'lines_to_read': len(df),
-                'columns': list(df.columns),
-                'file_name': file_name,
-                'other_parameters': other_params
-            }
-        except Exception as e:
-            print(f"Could not process {file_path}: {e}")
+    scan = functools.partial(scan_csv_file, directory=directory, normalize=normalize)
+    for result in map_in_processes(scan, csv_files):
+        if result is not None:
+            file_name, file_parameters = result
+            parameters[file_name] = file_parameters
             
     return parameters
 
@@ -84,7 +147,7 @@ if __name__ == '__main__':
     output_directory = 'json'
     os.makedirs(output_directory, exist_ok=True)
     output_filename = os.path.join(output_directory, 'parameters.json')
-    with open(output_filename, 'w') as f:
-        json.dump(csv_parameters, f, indent=4)
+    with open(output_filename, 'wb') as f:
+        f.write(orjson.dumps(csv_parameters, option=orjson.OPT_INDENT_2))
 
     print(f"Parameters saved to {output_filename}")
@@ -0,0 +1,134 @@
+import os
+import argparse
+import csv
+import pyarrow.parquet as pq
+from pyarrow import csv as pacsv
+from parallel import map_in_processes
+
+def find_transformed_files(data_dir):
+    """
+    Lists the transformed CSV files written by the C++ application.
+
+    Args:
+        data_dir (str): The directory where the data files are located.
+
+    Returns:
+        list: The paths of all '*_transformed.csv' files in the directory.
+    """
+    with os.scandir(data_dir) as entries:
+        return [
+            entry.path for entry in entries
+            if entry.is_file(follow_symlinks=False) and entry.name.endswith('_transformed.csv')
+        ]
+
+def unique_column_names(names):
+    """
+    Makes header names unique the same way pandas does.
+
+    Blank names become 'Unnamed: <index>' and repeated names get a '.1', '.2', ...
+    suffix, so every column can be selected by name.
+
+    Args:
+        names (list): The raw header names.
+
+    Returns:
+        list: The unique column names, in the same order.
+    """
+    counts = {}
+    unique_names = []
+    for index, name in enumerate(names):
+        name = name or f'Unnamed: {index}'
+        unique_name = name
+        while unique_name in counts:
+            counts[name] += 1
+            unique_name = f'{name}.{counts[name]}'
+        counts[unique_name] = 0
+        unique_names.append(unique_name)
+    return unique_names
+
+def read_header(file_path):
+    """
+    Reads only the header row of a CSV file.
+
+    Args:
+        file_path (str): The path to the CSV file.
+
+    Returns:
+        list: The unique column names, or an empty list if the file has no header.
+    """
+    with open(file_path, newline='', encoding='utf-8-sig') as f:
+        return unique_column_names(next(csv.reader(f), []))
+
+def read_csv_table(file_path, columns=None):
+    """
+    Reads a CSV file into a pyarrow Table using pyarrow's multithreaded CSV reader.
+
+    Columns are named by read_header, so the names match what callers see there.
+
+    Args:
+        file_path (str): The path to the CSV file.
+        columns (list, optional): If given, only these columns are parsed.
+            Defaults to None, which reads every column.
+
+    Returns:
+        pyarrow.Table: The parsed data.
+    """
+    read_options = pacsv.ReadOptions(use_threads=True, column_names=read_header(file_path), skip_rows=1)
+    convert_options = pacsv.ConvertOptions(include_columns=columns) if columns else None
+    return pacsv.read_csv(file_path, read_options=read_options, convert_options=convert_options)
+
+def parquet_path_for(file_path):
+    """
+    Returns the path of the Parquet copy kept next to a CSV file.
+
+    Args:
+        file_path (str): The path to the CSV file.
+
+    Returns:
+        str: The same path with the .csv extension replaced by .parquet.
+    """
+    return file_path.rsplit('.', 1)[0] + '.parquet'
+
+def convert_to_parquet(file_path):
+    """
+    Writes a zstd-compressed Parquet copy of a CSV file next to it.
+
+    The copy is written to a temporary file and moved into place, so an interrupted
+    write never leaves a truncated copy behind.
+
+    Args:
+        file_path (str): The path to the CSV file.
+
+    Returns:
+        str: The path of the Parquet copy, or None if the file could not be converted.
+    """
+    try:
+        if not read_header(file_path):
+            print(f"Warning: {os.path.basename(file_path)} is empty or has no columns. Skipping.")
+            return None
+
+        parquet_path = parquet_path_for(file_path)
+        temp_path = parquet_path + '.tmp'
+        pq.write_table(read_csv_table(file_path), temp_path, compression='zstd')
+        os.replace(temp_path, parquet_path)
+        return parquet_path
+
+    except Exception as e:
+        print(f"Could not convert {file_path}: {e}")
+        return None
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Convert transformed CSV files to Parquet for faster plotting.'
+    )
+    parser.add_argument(
+        '--data-dir',
+        type=str,
+        default='data',
+        help='Directory where the data files are located.'
+    )
+    args = parser.parse_args()
+
+    for parquet_path in map_in_processes(convert_to_parquet, find_transformed_files(args.data_dir)):
+        if parquet_path is not None:
+            print(f"Parquet copy saved to {parquet_path}")
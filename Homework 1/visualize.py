@@ -1,12 +1,18 @@
 
-import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import os
 import argparse
 import json
-import glob
 import random
+import csv
+import functools
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from parallel import map_in_processes
+from prepare import find_transformed_files, parquet_path_for, read_csv_table, read_header
 
 def format_column_name(column_name):
     """
@@ -21,6 +27,132 @@ def format_column_name(column_name):
     """
     return column_name.replace('_', ' ').title()
 
+def load_table(file_path, columns=None):
+    """
+    Loads columns of a transformed CSV file as a pyarrow Table.
+
+    When prepare.py has written a Parquet copy that is newer than the CSV, that copy is
+    memory-mapped and only the requested columns are read. Otherwise only the requested
+    columns are parsed from the CSV. A copy that cannot be opened is reported and skipped.
+
+    Args:
+        file_path (str): The path to the CSV file.
+        columns (list, optional): Columns to load. Defaults to None, which loads every column.
+
+    Returns:
+        pyarrow.Table: The loaded data.
+    """
+    parquet_path = parquet_path_for(file_path)
+    try:
+        is_fresh = os.stat(parquet_path).st_mtime_ns > os.stat(file_path).st_mtime_ns
+    except FileNotFoundError:
+        is_fresh = False
+
+    if is_fresh:
+        try:
+            parquet_file = pq.ParquetFile(parquet_path, memory_map=True)
+        except (OSError, pa.ArrowInvalid) as e:
+            print(f"Warning: Could not open {parquet_path}, reading the CSV instead (re-run prepare.py to rebuild it): {e}")
+        else:
+            # Parquet silently drops unknown columns; select() reports them instead
+            table = parquet_file.read(columns=columns)
+            return table.select(columns) if columns else table
+
+    return read_csv_table(file_path, columns)
+
+def read_data(file_path, columns=None):
+    """
+    Reads a CSV file into a DataFrame using pyarrow, via its Parquet copy when one is fresh.
+    Float columns are downcast to float32, since the transformed data is
+    normalized to [0, 1] and only used for plotting.
+
+    Args:
+        file_path (str): The path to the CSV file.
+        columns (list, optional): If given, only these columns are loaded.
+            Defaults to None, which reads every column.
+
+    Returns:
+        pandas.DataFrame: The parsed data.
+    """
+    table = load_table(file_path, columns)
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    return df.astype({column: 'float32' for column in df.select_dtypes('float64').columns})
+
+def decimate_min_max(values, n_buckets=2000):
+    """
+    Reduces a long series to the minimum and maximum of each of n_buckets equal buckets.
+
+    The visual envelope of the line is preserved while the number of vertices handed
+    to matplotlib stays bounded at about 2 * n_buckets, regardless of the series length.
+    Series shorter than 4 * n_buckets are returned unchanged.
+
+    Args:
+        values (numpy.ndarray): The 1-D series to decimate.
+        n_buckets (int): The number of buckets to split the series into.
+
+    Returns:
+        tuple: The (x, y) arrays to plot, where x holds the original indices.
+    """
+    n = len(values)
+    if n < 4 * n_buckets:
+        return np.arange(n), values
+
+    bucket_size = n // n_buckets
+    buckets = values[:n_buckets * bucket_size].reshape(n_buckets, bucket_size)
+    offsets = np.arange(n_buckets) * bucket_size
+    extremes = [
+        np.stack([buckets.argmin(axis=1), buckets.argmax(axis=1)], axis=1) + offsets[:, None]
+    ]
+
+    # Leftover points past the last full bucket form one final bucket
+    tail_start = n_buckets * bucket_size
+    if tail_start < n:
+        tail = values[tail_start:]
+        extremes.append(np.array([[tail.argmin(), tail.argmax()]]) + tail_start)
+
+    # Keep each bucket's min and max in their original order
+    indices = np.sort(np.concatenate(extremes), axis=1).ravel()
+    return indices, values[indices]
+
+def load_comparison_column(file_path, column, ascending=False, descending=False):
+    """
+    Loads one column from a transformed CSV file and optionally sorts it.
+    Only the requested column is parsed.
+
+    create_comparison_plot calls this once per file through map_in_processes.
+
+    Args:
+        file_path (str): The path to the transformed CSV file.
+        column (str): The name of the column to load.
+        ascending (bool): If True, sort data in ascending order.
+        descending (bool): If True, sort data in descending order.
+
+    Returns:
+        numpy.ndarray: The column data, or None if the file could not be used.
+    """
+    try:
+        column_data = read_data(file_path, columns=[column]).iloc[:, 0].dropna()
+        if column_data.empty:
+            print(f"Warning: {os.path.basename(file_path)} is empty or has no columns. Skipping.")
+            return None
+
+        # Sorting needs a writable float32 copy, since pandas may hand back a read-only view
+        processed_data = column_data.to_numpy(dtype=np.float32, copy=ascending or descending)
+
+        if ascending:
+            # Sort the data from least to greatest
+            processed_data.sort()
+        elif descending:
+            # Sort the data from greatest to least
+            processed_data.sort()
+            processed_data = processed_data[::-1]
+
+        return processed_data
+
+    except Exception as e:
+        print(f"Error processing {file_path}: {e}")
+        return None
+
 def create_comparison_plot(data_dir, images_dir, ascending=False, descending=False):
     """
     Loads transformed CSV files, selects a random column from each, optionally sorts them,
@@ -32,44 +164,46 @@ def create_comparison_plot(data_dir, images_dir, ascending=False, descending=Fal
         ascending (bool): If True, sort data in ascending order.
         descending (bool): If True, sort data in descending order.
     """
-    transformed_files = glob.glob(os.path.join(data_dir, '*_transformed.csv'))
+    transformed_files = find_transformed_files(data_dir)
     if len(transformed_files) < 2:
         print("Error: Less than two transformed CSV files found. Cannot create comparison plot.")
         return
 
+    # Headers are read and a column picked up front, so workers only parse that column.
+    # Paths and chosen columns are kept as parallel lists that feed map_in_processes directly.
+    file_paths = []
+    chosen_columns = []
+    for file_path in transformed_files:
+        try:
+            columns = read_header(file_path)
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            print(f"Error processing {file_path}: {e}")
+            continue
+        if not columns:
+            print(f"Warning: {os.path.basename(file_path)} is empty or has no columns. Skipping.")
+            continue
+        file_paths.append(file_path)
+        chosen_columns.append(random.choice(columns))
+
+    # Each chosen column name is formatted once
+    labels = [format_column_name(column) for column in chosen_columns]
+
+    load = functools.partial(load_comparison_column, ascending=ascending, descending=descending)
+    loaded_data = map_in_processes(load, file_paths, chosen_columns)
+
     plt.figure(figsize=(12, 8))
     
     plot_labels = []
 
-    for file_path in transformed_files:
-        try:
-            df = pd.read_csv(file_path)
-            if df.empty or len(df.columns) == 0:
-                print(f"Warning: {os.path.basename(file_path)} is empty or has no columns. Skipping.")
-                continue
-
-            random_column = random.choice(df.columns)
-            
-            column_data = df[random_column].dropna()
-
-            if ascending:
-                # Sort the data from least to greatest
-                processed_data = np.sort(column_data)
-            elif descending:
-                # Sort the data from greatest to least
-                processed_data = np.sort(column_data)[::-1]
-            else:
-                # Use original order
-                processed_data = column_data.values
-            
-            # Plot the sorted data
-            plt.plot(processed_data, label=format_column_name(random_column))
-            plot_labels.append(format_column_name(random_column))
-
-        except Exception as e:
-            print(f"Error processing {file_path}: {e}")
+    for label, processed_data in zip(labels, loaded_data):
+        if processed_data is None:
             continue
 
+        # Plot the sorted data, decimated to a bounded number of vertices
+        x, y = decimate_min_max(processed_data)
+        plt.plot(x, y, label=label)
+        plot_labels.append(label)
+
     if not plot_labels:
         print("No data was plotted. Skipping plot generation.")
         plt.close()
@@ -91,9 +225,8 @@ def create_comparison_plot(data_dir, images_dir, ascending=False, descending=Fal
     plt.grid(True, which='both', axis='y', linestyle='--', linewidth=0.5)
     plt.yticks(np.arange(0, 1.1, 0.1))
 
-    if not os.path.exists(images_dir):
-        os.makedirs(images_dir)
-        
+    os.makedirs(images_dir, exist_ok=True)
+
     output_path = os.path.join(images_dir, 'random_column_comparison.png')
     plt.savefig(output_path, bbox_inches='tight')
     plt.close()